@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+# Benchmark for the Wayback pattern scan against the original nested-loop implementation.
+#
+# Usage:
+# python bench_r3c0nkthx.py [url_count]
+
+import random
+import re
+import sys
+import time
+
+import r3c0nkthx
+
+SEGMENTS = [
+    "static", "img", "css", "blog", "2019", "index.html", "news", "p",
+    "api", "admin", "js", "account", "cgi-bin", "wp-admin",
+    "login?password=2", "auth?response_type=token", "user?isAdmin=1",
+]
+PLAIN_SEGMENTS = SEGMENTS[:8]
+
+# Original find_interesting_urls, kept as the reference for counts and timing
+def baseline_find_interesting_urls(urls):
+    patterns = dict.fromkeys(r3c0nkthx.INTERESTING_PATTERNS, 0)
+    for url in urls:
+        for pattern in patterns.keys():
+            if pattern in url:
+                patterns[pattern] += 1
+    return patterns
+
+# Function to generate reproducible URLs, roughly one in six containing a pattern
+def synthetic_urls(count, seed=1):
+    rng = random.Random(seed)
+    urls = []
+    for i in range(count):
+        path = "/".join(
+            rng.choice(SEGMENTS) if rng.random() < 0.15 else rng.choice(PLAIN_SEGMENTS)
+            for _ in range(rng.randint(1, 5))
+        )
+        urls.append(f"http://sub{i % 50}.example.com/{path}")
+    return urls
+
+# Single generated regex alternation, kept to show why the fallback does not use one
+def regex_find_interesting_urls(urls):
+    patterns = r3c0nkthx.INTERESTING_PATTERNS
+    regex = re.compile("|".join(map(re.escape, sorted(patterns, key=len, reverse=True))))
+    counts = dict.fromkeys(patterns, 0)
+    for url in urls:
+        for pattern in set(regex.findall(url)):
+            counts[pattern] += 1
+    return counts
+
+# Function to split a CDX response body into read-sized chunks
+def cdx_chunks(urls, size=r3c0nkthx.WAYBACK_READ_SIZE):
+    body = "".join(url + "\n" for url in urls).encode()
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+# Function to time the CDX hot path: line-aligned blocks fed to the shared matcher
+def scan_blocks(chunks):
+    match_interesting = r3c0nkthx.get_interesting_matcher()
+    counts = r3c0nkthx.new_pattern_counts()
+    for block in r3c0nkthx.iter_line_blocks(chunks):
+        match_interesting(block, counts)
+    return dict(zip(r3c0nkthx.INTERESTING_PATTERNS, counts))
+
+def timed(label, func, data, reference):
+    start = time.perf_counter()
+    result = func(data)
+    elapsed = time.perf_counter() - start
+    status = "ok" if result == reference else "MISMATCH"
+    print(f"{label:<32} {elapsed:.3f}s  {status}")
+    return result == reference
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    urls = synthetic_urls(count)
+    chunks = cdx_chunks(urls)
+    reference = baseline_find_interesting_urls(urls)
+
+    print(f"{count} URLs")
+    ok = timed("baseline nested loop (str)", baseline_find_interesting_urls, urls, reference)
+    timed("regex alternation (str)", regex_find_interesting_urls, urls, reference)
+    ok &= timed("find_interesting_urls (str)", r3c0nkthx.find_interesting_urls, urls, reference)
+    ok &= timed("CDX scan (64 KiB blocks)", scan_blocks, chunks, reference)
+    sys.exit(0 if ok else 1)
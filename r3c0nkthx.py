@@ -3,9 +3,9 @@
 # Author: Richard Hyunho Im (@richeeta)
 # Description: 
 # A recon tool designed for bug bounty hunters and security researchers to quickly assess 
-# a domain's presence in the Wayback Machine (archived URLs) and to check the current 
-# HTTP status of a domain via curl. It supports multiple input formats including text files, 
-# single domains, and comma-separated domain lists. The tool includes options for proxy usage, 
+# a domain's presence in the Wayback Machine (archived URLs, via the CDX API) and to check the current 
+# HTTP status of a domain via a pooled HTTP session. It supports multiple input formats 
+# including text files, single domains, and comma-separated domain lists. The tool includes options for proxy usage, 
 # verbosity levels for detailed output, and the ability to save results to an output file. 
 #
 # Common Use Cases:
@@ -20,7 +20,12 @@
 # Options:
 # -v        : Enable verbose output (prints Wayback URLs and HTTP responses)
 # -vv       : Enable extra verbose output (for future extensibility)
-# --proxy   : Specify a proxy to route curl requests through
+# --proxy   : Specify a proxy to route HTTP status requests through
+# --rate    : Max Wayback CDX requests per second (default: 0.8)
+# --concurrency : Number of domains processed concurrently (default: 50)
+# --no-cache    : Ignore the on-disk Wayback cache (~/.r3c0nkthx/cache.sqlite3)
+# --cache-ttl   : Hours before cached Wayback results expire (default: 24)
+# --check-deps  : Re-run the Python dependency check (otherwise done once per install)
 # -o <file> : Save the output to a specified file
 #
 # Examples:
@@ -34,172 +39,791 @@
 #
 
 import sys
-import subprocess
+import atexit
 import argparse
 import os
-from tqdm import tqdm
-import shutil
+import re
+import json
+import socket
+import sqlite3
+import time
+from array import array
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+import threading
+import queue
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Helper to check and install missing tools
-def check_and_install_tool(tool_name, install_command=None):
-    """Check if a tool is installed, otherwise prompt for installation."""
-    if shutil.which(tool_name) is None:
-        print(f"{tool_name} is not installed.")
-        if install_command:
-            try:
-                print(f"Attempting to install {tool_name}...")
-                subprocess.check_call(install_command, shell=True)
-                print(f"{tool_name} installed successfully.")
-            except subprocess.CalledProcessError as e:
-                print(f"Failed to install {tool_name}: {e}")
-                sys.exit(1)
-        else:
-            print(f"Please install {tool_name} manually and try again.")
-            sys.exit(1)
+# Number of domains processed concurrently. Network I/O, not CPU, is the limit here
+DEFAULT_CONCURRENCY = 50
+
+# Connection pool sizing shared by every HTTP session: one pool per host
+# (up to POOL_CONNECTIONS hosts) and enough connections for every worker
+POOL_CONNECTIONS = 100
+POOL_MAXSIZE = DEFAULT_CONCURRENCY
+
+# (connect, read) timeouts and transport-level retries for transient failures.
+# Retry-After is not honoured here (a target could ask for days); CDX requests get their
+# own adapter without status retries so every request that reaches the archive passes
+# through the rate limiter, which handles 429 and these statuses itself
+HTTP_TIMEOUT = (5, 25)
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (502, 503, 504)
+
+# Wayback Machine CDX endpoint (the same index `waybackurls` queries)
+WAYBACK_PREFIXES = ('http://web.archive.org/', 'https://web.archive.org/')
+WAYBACK_CDX_URL = "http://web.archive.org/cdx/search/cdx?url=*.{domain}/*&output=txt&fl=original&collapse=urlkey"
+
+# The Internet Archive throttles (and eventually IP-bans) clients above ~60 CDX requests/min
+DEFAULT_RATE = 0.8
+WAYBACK_MAX_RETRIES = 5
+# CDX responses run to many MB; read them in large blocks rather than requests' 512-byte default
+WAYBACK_READ_SIZE = 1 << 16
+WAYBACK_BLOCK_SECONDS = 60
+
+# URL fragments worth flagging in Wayback results
+INTERESTING_PATTERNS = (
+    "/api/",
+    "/admin/",
+    "/js/",
+    "/account/",
+    "/cgi-bin/",
+    "/wp-admin/",
+    "response_type=token",
+    "password=",
+    "isAdmin=",
+)
+
+# ANSI escapes and the status-code color table used for terminal output
+BOLD = "\033[1m"
+GREEN = "\033[92m"
+YELLOW = "\033[93m"  # Orange/Yellow
+RED = "\033[91m"
+RESET = "\033[0m"
+HTTP_COLOR = {
+    200: GREEN,
+    301: YELLOW,
+    302: YELLOW,
+    404: YELLOW,
+    400: RED,
+    401: RED,
+    403: RED,
+    503: RED,
+}
+
+# Per-user state: the Wayback result cache and the dependency-check sentinel
+APP_DIR = os.path.join(os.path.expanduser('~'), '.r3c0nkthx')
+DEPS_SENTINEL = os.path.join(APP_DIR, '.deps_ok')
+
+# On-disk Wayback result cache, reused across runs until entries expire
+CACHE_PATH = os.path.join(APP_DIR, 'cache.sqlite3')
+DEFAULT_CACHE_TTL_HOURS = 24
+
+# Status codes from servers that refuse HEAD requests
+HEAD_UNSUPPORTED = (405, 501)
+
+# Scheme prefix kept for the HTTP check, and the hostnames (with an optional port)
+# accepted after normalization; any path after the host is passed through
+SCHEME_PREFIX = re.compile(r'^(https?)://', re.IGNORECASE)
+VALID_DOMAIN = re.compile(r'[a-z0-9._\-]+(:\d+)?')
+
+# Hostname -> Future of its tuple of addresses (None if the name does not exist), submitted
+# in bulk at the start of each run and consumed by the HTTP check's connections
+DNS_CACHE = {}
+DNS_WORKERS = 64
+
+# Matcher for INTERESTING_PATTERNS, built on first use by get_interesting_matcher
+_MATCHER = None
+_MATCHER_LOCK = threading.Lock()
+
+# Sessions are cached per proxy so their connection pools survive across domains
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+# Worker pools shared across process_input calls (e.g. when imported as a library):
+# "domains" runs process_domain, "status" runs the HTTP checks it fans out.
+# Maps name -> (executor, max_workers)
+_EXECUTORS = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+# Token bucket shared by every worker querying the CDX API
+class RateLimiter:
+    """Thread-safe token bucket with a shared freeze for when the server pushes back."""
+
+    def __init__(self, rate=DEFAULT_RATE, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent. A rate of 0 disables throttling."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.rate <= 0:
+                    return
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                    self.last_refill = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def block(self, seconds):
+        """Freeze every worker for the given number of seconds."""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+WAYBACK_LIMITER = RateLimiter()
+
+# SQLite-backed store of Wayback results keyed by domain
+class WaybackCache:
+    """Thread-safe on-disk cache of (url_count, interesting_pattern_counts) per domain."""
+
+    def __init__(self, path=CACHE_PATH, ttl_hours=DEFAULT_CACHE_TTL_HOURS):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl_hours * 3600
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS wayback ("
+                "domain TEXT PRIMARY KEY, url_count INTEGER, pattern_counts TEXT, fetched_at REAL)"
+            )
+
+    def get(self, domain):
+        """Return the cached result for a domain, or None if missing or expired."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT url_count, pattern_counts, fetched_at FROM wayback WHERE domain = ?", (domain,)
+            ).fetchone()
+        if row is None or time.time() - row[2] >= self.ttl:
+            return None
+        pattern_counts = json.loads(row[1])
+        # Entries written with a different pattern set are treated as stale
+        if list(pattern_counts) != list(INTERESTING_PATTERNS):
+            return None
+        return row[0], pattern_counts
+
+    def set(self, domain, url_count, pattern_counts):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO wayback VALUES (?, ?, ?, ?)",
+                (domain, url_count, json.dumps(pattern_counts), time.time()),
+            )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+WAYBACK_CACHE = None
 
 # Function to install missing Python packages
 def install_missing_packages():
+    import subprocess
     try:
         import tqdm
     except ImportError:
         subprocess.check_call([sys.executable, "-m", "pip", "install", "tqdm"])
+    try:
+        import requests
+    except ImportError:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "requests"])
+
+# Function to check dependencies once per install (or whenever forced)
+def ensure_dependencies(force=False):
+    if not force and os.path.exists(DEPS_SENTINEL):
+        return
+    install_missing_packages()
+    try:
+        os.makedirs(APP_DIR, exist_ok=True)
+        Path(DEPS_SENTINEL).touch()
+    except OSError:
+        pass
+
+# Function to get (or create) the keep-alive session for a proxy
+def get_session(proxy=None):
+    """Return a shared requests.Session for the given proxy, creating it on first use."""
+    # Imported lazily so --help and argument errors return without loading requests
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(proxy)
+        if session is None:
+            session = requests.Session()
+            # Retry connection errors and gateway failures with exponential backoff;
+            # if a status keeps failing, return the last response instead of raising
+            retry = Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF, status_forcelist=RETRY_STATUSES,
+                          allowed_methods=['HEAD', 'GET'], respect_retry_after_header=False, raise_on_status=False)
+            adapter = dns_cache_adapter(max_retries=retry, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            # The archive only gets connect retries (the request never reached it);
+            # anything it answers goes back to fetch_wayback_urls and the rate limiter
+            wayback_retry = Retry(total=RETRY_TOTAL, connect=RETRY_TOTAL, read=0, status=0, redirect=0,
+                                  backoff_factor=RETRY_BACKOFF, respect_retry_after_header=False)
+            wayback_adapter = HTTPAdapter(max_retries=wayback_retry, pool_maxsize=POOL_MAXSIZE)
+            for prefix in WAYBACK_PREFIXES:
+                session.mount(prefix, wayback_adapter)
+            _SESSIONS[proxy] = session
+        return session
+
+# Function to build an HTTPAdapter that connects through the addresses in DNS_CACHE
+def dns_cache_adapter(**kwargs):
+    """Return an HTTPAdapter whose new connections try each pre-resolved address of the
+    host in turn, instead of resolving it again; uncached hosts resolve as usual."""
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+    from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+    class CachedDNSConnection:
+        def _new_conn(self):
+            addresses = cached_addresses(self._dns_host)
+            if not addresses:
+                return super()._new_conn()
+            # Only the socket target changes; Host and SNI still come from self.host
+            host, error = self._dns_host, None
+            try:
+                for address in addresses:
+                    self._dns_host = address
+                    try:
+                        return super()._new_conn()
+                    except (ConnectTimeoutError, NewConnectionError) as e:
+                        error = e
+            finally:
+                self._dns_host = host
+            raise error
+
+    class CachedDNSHTTPConnection(CachedDNSConnection, HTTPConnection):
+        pass
+
+    class CachedDNSHTTPSConnection(CachedDNSConnection, HTTPSConnection):
+        pass
+
+    class CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CachedDNSHTTPConnection
+
+    class CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CachedDNSHTTPSConnection
+
+    class CachedDNSAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                'http': CachedDNSHTTPConnectionPool,
+                'https': CachedDNSHTTPSConnectionPool,
+            }
 
-# Ensure that `waybackurls` and `curl` are installed
-def ensure_dependencies():
-    # Check if 'curl' and 'waybackurls' are installed, else prompt for installation
-    check_and_install_tool('curl')
-    check_and_install_tool('waybackurls', install_command="go install github.com/tomnomnom/waybackurls@latest")
+    return CachedDNSAdapter(**kwargs)
 
-# Function to check Wayback URLs for a domain
+# Function to parse a Retry-After header (seconds or HTTP date) into seconds
+def parse_retry_after(value):
+    if not value:
+        return 0
+    try:
+        return max(0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 0
+
+# Function to regroup a byte stream into blocks that end on a line boundary
+def iter_line_blocks(chunks):
+    """Yield blocks of whole lines from an iterable of byte chunks; a final unterminated
+    line is yielded on its own."""
+    pending = b''
+    for chunk in chunks:
+        chunk = pending + chunk
+        end = chunk.rfind(b'\n') + 1
+        if end:
+            yield chunk[:end]
+        pending = chunk[end:]
+    if pending:
+        yield pending
+
+# Function to stream Wayback URLs for a domain from the CDX API
+def fetch_wayback_urls(domain, verbose=False):
+    """Stream a domain's archived URLs, returning (url_count, interesting_pattern_counts)."""
+    wayback_count = 0
+    match_interesting = get_interesting_matcher()
+    counts = new_pattern_counts()
+    for attempt in range(WAYBACK_MAX_RETRIES):
+        WAYBACK_LIMITER.acquire()
+        resp = get_session().get(WAYBACK_CDX_URL.format(domain=domain), timeout=HTTP_TIMEOUT, stream=True)
+        if resp.status_code != 429 and resp.status_code not in RETRY_STATUSES:
+            break
+        resp.close()
+        if resp.status_code == 429:
+            # Rate limited: freeze all workers, backing off exponentially on repeats
+            freeze = max(parse_retry_after(resp.headers.get('Retry-After')), WAYBACK_BLOCK_SECONDS * 2 ** attempt)
+            if verbose:
+                log(f"Wayback CDX API rate limited, pausing for {freeze:.0f}s")
+            WAYBACK_LIMITER.block(freeze)
+        else:
+            # Transient gateway failure: back off, then retry through the limiter
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+    with resp:
+        resp.raise_for_status()
+        # Read raw bytes in large blocks and count and scan each block whole, so the URL
+        # list is never held in memory and only URLs that are printed ever get decoded
+        for block in iter_line_blocks(resp.iter_content(chunk_size=WAYBACK_READ_SIZE)):
+            # Blank lines are rare; rebuild the block without them only when present
+            if block.startswith(b'\n') or b'\n\n' in block:
+                block = b''.join(line + b'\n' for line in block.split(b'\n') if line)
+                if not block:
+                    continue
+            wayback_count += block.count(b'\n') + (not block.endswith(b'\n'))
+            match_interesting(block, counts)
+            if verbose:
+                log("\n".join(f"Wayback URL: {url.decode('utf-8', 'replace')}" for url in block.splitlines()))
+    return wayback_count, dict(zip(INTERESTING_PATTERNS, counts))
+
+# Function to check Wayback URLs for a domain, served from the cache when fresh
 def check_wayback_urls(domain, verbose=False):
+    """Return (url_count, interesting_pattern_counts) for a domain."""
+    if WAYBACK_CACHE is not None:
+        cached = WAYBACK_CACHE.get(domain)
+        if cached is not None:
+            if verbose:
+                log(f"Wayback results for {domain} loaded from cache")
+            return cached
     try:
-        result = subprocess.run(['waybackurls', domain], capture_output=True, text=True)
-        urls = result.stdout.strip().split('\n')
-        if verbose:
-            for url in urls:
-                print(f"Wayback URL: {url}")
-        return urls
+        wayback_count, interesting = fetch_wayback_urls(domain, verbose=verbose)
     except Exception as e:
-        print(f"Error running waybackurls for {domain}: {e}")
-        return []
+        log(f"Error querying Wayback CDX API for {domain}: {e}")
+        return 0, dict.fromkeys(INTERESTING_PATTERNS, 0)
+    # Only successful lookups are cached, so failures are retried next run
+    if WAYBACK_CACHE is not None:
+        WAYBACK_CACHE.set(domain, wayback_count, interesting)
+    return wayback_count, interesting
 
-# Function to check HTTP response using curl
+# Function to get (or create) a shared worker pool
+def get_executor(max_workers=None, name='domains'):
+    """Return the named shared ThreadPoolExecutor, rebuilding it if a different size is requested.
+
+    Without max_workers the existing pool is returned as is (or a default-sized one created).
+    """
+    with _EXECUTORS_LOCK:
+        executor, size = _EXECUTORS.get(name, (None, None))
+        if executor is None or (max_workers is not None and max_workers != size):
+            if executor is not None:
+                # Pools are idle between process_input calls; anything still queued finishes
+                executor.shutdown(wait=False)
+            size = DEFAULT_CONCURRENCY if max_workers is None else max_workers
+            executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f'r3c0n-{name}')
+            atexit.register(executor.shutdown)
+            _EXECUTORS[name] = (executor, size)
+        return executor
+
+# Function to grow the per-host connection pools to at least the given size
+def set_pool_maxsize(maxsize):
+    """Raise POOL_MAXSIZE, dropping cached sessions so they are rebuilt with the new size."""
+    global POOL_MAXSIZE
+    with _SESSIONS_LOCK:
+        if maxsize > POOL_MAXSIZE:
+            POOL_MAXSIZE = maxsize
+            for session in _SESSIONS.values():
+                session.close()
+            _SESSIONS.clear()
+
+# Function to build the URL used for a domain's HTTP check
+def http_url(domain):
+    # Like curl, treat a bare domain as plain HTTP
+    return domain if '://' in domain else f"http://{domain}"
+
+# Function to resolve hostnames in bulk ahead of the HTTP checks
+def resolve_host(host):
+    """Return host's addresses, None if the name does not exist, or () if the lookup failed
+    for any other reason (EAI_AGAIN and the like), leaving resolution to the connection."""
+    try:
+        return tuple(dict.fromkeys(info[4][0] for info in socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)))
+    except socket.gaierror as e:
+        return None if e.errno == socket.EAI_NONAME else ()
+    except UnicodeError:
+        # The name cannot be IDNA-encoded (e.g. a label over 63 characters), so it never resolves
+        return None
+    except OSError:
+        return ()
+
+def resolve_hosts(hosts):
+    """Start resolving hostnames concurrently, storing a Future per host in DNS_CACHE."""
+    resolver = get_executor(DNS_WORKERS, name='dns')
+    for host in hosts:
+        if host and host not in DNS_CACHE:
+            DNS_CACHE[host] = resolver.submit(resolve_host, host)
+
+# Function to look up a host in DNS_CACHE, waiting for its lookup if still in flight
+def cached_addresses(host):
+    """Return the host's pre-resolved addresses (() if it was not pre-resolved), or None if the name does not exist."""
+    future = DNS_CACHE.get(host)
+    return future.result() if future is not None else ()
+
+# Function to check HTTP response using the pooled session
 def check_http_response(domain, proxy=None, verbose=False):
-    curl_cmd = ['curl', '-s', '-o', '/dev/null', '-w', '%{http_code}', domain]
-    if proxy:
-        curl_cmd.extend(['--proxy', proxy])
+    url = http_url(domain)
+    # Names the pre-resolve found not to exist are reported without a request (and its
+    # connection retries); the others connect through their cached addresses
+    if not proxy and cached_addresses(urlsplit(url).hostname) is None:
+        log(f"Error checking HTTP response for {domain}: could not resolve host")
+        return None
     try:
-        result = subprocess.run(curl_cmd, capture_output=True, text=True)
+        session = get_session(proxy)
+        # Passed per request: session.proxies would lose to HTTP(S)_PROXY from the environment
+        proxies = {'http': proxy, 'https': proxy} if proxy else None
+        # HEAD keeps the body off the wire; fall back to a one-byte ranged GET if it is rejected
+        resp = session.head(url, allow_redirects=False, proxies=proxies, timeout=HTTP_TIMEOUT)
+        if resp.status_code in HEAD_UNSUPPORTED:
+            resp = session.get(url, headers={'Range': 'bytes=0-0'}, allow_redirects=False, stream=True,
+                               proxies=proxies, timeout=HTTP_TIMEOUT)
+            resp.close()
+            # A 206 only reflects our Range header; the plain request would have been a 200
+            if resp.status_code == 206:
+                resp.status_code = 200
         if verbose:
-            print(f"HTTP response: {result.stdout}")
-        return int(result.stdout.strip())
+            log(f"HTTP response: {resp.status_code}")
+        return resp.status_code
     except Exception as e:
-        print(f"Error running curl for {domain}: {e}")
+        log(f"Error checking HTTP response for {domain}: {e}")
         return None
 
-# Function to print results with colored output
-def print_colored_output(domain, wayback_count, http_status, interesting_directories):
-    """Prints the result for each domain with colored output."""
-    bold_domain = f"\033[1m{domain}\033[0m"
-
+# Function to format results with colored output
+def format_colored_output(domain, wayback_count, http_status, interesting_directories):
+    """Formats the result block for a domain with colored output."""
     # Wayback URL coloring
     if 5 <= wayback_count <= 9999:
-        wayback_color = f"\033[92m{wayback_count}\033[0m"  # Green
+        wayback_color = f"{GREEN}{wayback_count}{RESET}"
     else:
         wayback_color = f"{wayback_count}"
 
     # HTTP status coloring
-    if http_status == 200:
-        http_color = f"\033[92m{http_status}\033[0m"  # Green
-    elif http_status in [301, 302, 404]:
-        http_color = f"\033[93m{http_status}\033[0m"  # Orange/Yellow
-    elif http_status in [400, 401, 403, 503]:
-        http_color = f"\033[91m{http_status}\033[0m"  # Red
-    else:
-        http_color = f"{http_status}"
+    http_color = f"{HTTP_COLOR[http_status]}{http_status}{RESET}" if http_status in HTTP_COLOR else f"{http_status}"
 
-    # Print the main result
-    print(f"{bold_domain} | Wayback URLs: {wayback_color} | HTTP Status Code: {http_color}")
+    lines = [
+        f"{BOLD}{domain}{RESET} | Wayback URLs: {wayback_color} | HTTP Status Code: {http_color}",
+        "Wayback URLs with Interesting Directories or Parameters:",
+    ]
+    lines.extend(f" - {key} URLs: [{value}]" for key, value in interesting_directories.items() if value > 0)
+    return "\n".join(lines) + "\n"
 
-    # Print interesting directories or parameters
-    print("Wayback URLs with Interesting Directories or Parameters:")
-    for key, value in interesting_directories.items():
-        if value > 0:
-            print(f" - {key} URLs: [{value}]")
-    
+# Function to print results with colored output
+def print_colored_output(domain, wayback_count, http_status, interesting_directories):
+    """Prints the result for each domain with colored output."""
+    sys.stdout.write(format_colored_output(domain, wayback_count, http_status, interesting_directories))
     sys.stdout.flush()
 
+# Function to format results for the output file
+def format_plain_output(domain, wayback_count, http_status, interesting_directories):
+    """Formats the uncolored result block for a domain."""
+    lines = [f"{domain} | Wayback URLs: {wayback_count} | HTTP Status Code: {http_status}"]
+    lines.extend(f" - {key} URLs: [{value}]" for key, value in interesting_directories.items() if value > 0)
+    return "\n".join(lines) + "\n"
+
+# Function to drain queued result blocks into a stream until a None sentinel arrives
+def drain_queue(q, stream):
+    while (block := q.get()) is not None:
+        stream.write(block)
+        # Flush in batches: only once the queue has gone idle
+        if q.empty():
+            stream.flush()
+    stream.flush()
+
+# Function to print queued result blocks to stdout from a single thread
+def printer(q):
+    drain_queue(q, sys.stdout)
+
+# The running process_input's printer queue, so worker messages share its single writer
+PRINT_QUEUE = None
+
+# Function to print a message from any thread without interleaving with result blocks
+def log(message):
+    print_queue = PRINT_QUEUE
+    if print_queue is not None:
+        print_queue.put(message + "\n")
+    else:
+        print(message)
+
+# Function to write queued result blocks through one open file handle
+def writer(q, f):
+    drain_queue(q, f)
+
+# Function to build a single-pass matcher over a set of patterns
+def build_pattern_matcher(patterns):
+    """Compile the pattern set once and return a function match(buffer, counts).
+
+    buffer holds one or more URLs as newline-separated bytes; match adds to
+    counts[pattern_id] (pattern_id being the index into `patterns`) the number of
+    those URLs that contain the pattern, so each URL counts at most once per pattern.
+    """
+    # Optional C extensions, fastest first; falls back to bytes searches
+    try:
+        import hyperscan
+    except ImportError:
+        hyperscan = None
+    try:
+        import ahocorasick
+    except ImportError:
+        ahocorasick = None
+
+    if hyperscan is not None:
+        # Compiled to a DFA and run over the whole buffer; matches arrive in end-offset
+        # order, so remembering the last line counted per pattern dedupes them
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[re.escape(pattern).encode() for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+        )
+        # Scratch space is per-thread in Hyperscan
+        local = threading.local()
+
+        def count_match(pattern_id, start, end, flags, context):
+            buffer, counts, last_line = context
+            line = buffer.rfind(b'\n', 0, end) + 1
+            if last_line[pattern_id] != line:
+                last_line[pattern_id] = line
+                counts[pattern_id] += 1
+
+        def match_hyperscan(buffer, counts):
+            if not hasattr(local, 'scratch'):
+                local.scratch = hyperscan.Scratch(db)
+            db.scan(buffer, match_event_handler=count_match, context=(buffer, counts, [-1] * len(patterns)),
+                    scratch=local.scratch)
+        return match_hyperscan
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for pattern_id, pattern in enumerate(patterns):
+            automaton.add_word(pattern, pattern_id)
+        automaton.make_automaton()
+
+        def match_ahocorasick(buffer, counts):
+            # The automaton works on str; latin-1 maps bytes 1:1, so ASCII patterns match
+            # exactly without the cost of UTF-8 validation
+            text = buffer.decode('latin-1')
+            last_line = [-1] * len(patterns)
+            for end, pattern_id in automaton.iter(text):
+                line = text.rfind('\n', 0, end) + 1
+                if last_line[pattern_id] != line:
+                    last_line[pattern_id] = line
+                    counts[pattern_id] += 1
+        return match_ahocorasick
+
+    # No extension available: for each pattern, C-level bytes.find hops from one hit to
+    # the next line, so Python only runs per matching URL. Unlike a single regex
+    # alternation this is exact for any pattern set, and much faster under CPython's
+    # regex engine, which cannot skip ahead on a common first character such as "/"
+    encoded = [(pattern_id, pattern.encode()) for pattern_id, pattern in enumerate(patterns)]
+
+    def match_substrings(buffer, counts):
+        find = buffer.find
+        for pattern_id, pattern in encoded:
+            hits = 0
+            pos = find(pattern)
+            while pos >= 0:
+                hits += 1
+                line_end = find(b'\n', pos)
+                if line_end < 0:
+                    break
+                pos = find(pattern, line_end + 1)
+            counts[pattern_id] += hits
+    return match_substrings
+
+# Function to get the shared matcher for INTERESTING_PATTERNS
+def get_interesting_matcher():
+    """Build the matcher on first use, so --help and argument errors never compile it."""
+    global _MATCHER
+    with _MATCHER_LOCK:
+        if _MATCHER is None:
+            _MATCHER = build_pattern_matcher(INTERESTING_PATTERNS)
+        return _MATCHER
+
+# Function to create zeroed per-pattern counters, indexed by pattern ID
+def new_pattern_counts():
+    return array('Q', bytes(8 * len(INTERESTING_PATTERNS)))
+
 # Function to find interesting URLs
 def find_interesting_urls(urls):
-    patterns = {
-        "/api/": 0,
-        "/admin/": 0,
-        "/js/": 0,
-        "/account/": 0,
-        "/cgi-bin/": 0,
-        "/wp-admin/": 0,
-        "response_type=token": 0,
-        "password=": 0,
-        "isAdmin=": 0
-    }
-
-    for url in urls:
-        for pattern in patterns.keys():
-            if pattern in url:
-                patterns[pattern] += 1
-    
-    return patterns
+    counts = new_pattern_counts()
+    buffer = b'\n'.join(url.encode() if isinstance(url, str) else url for url in urls)
+    get_interesting_matcher()(buffer, counts)
+    return dict(zip(INTERESTING_PATTERNS, counts))
+
+# Function to read a domain list file (one domain per line, blank lines ignored)
+def read_domain_file(path):
+    # One read, one UTF-8 decode and one C-level split instead of a per-line loop
+    return Path(path).read_bytes().decode('utf-8', errors='replace').split()
+
+# Function to normalize a domain into its (key, target) pair
+def normalize_domain(domain):
+    """Return (key, target) for an input entry.
+
+    key is the scheme-less entry with a lowercased host and no trailing slash; it is used
+    for deduplication, the Wayback lookup and the cache. target is the same entry with the
+    scheme the user gave (if any), so the HTTP check still goes over HTTPS when asked to.
+    """
+    domain = domain.strip().rstrip('/')
+    match = SCHEME_PREFIX.match(domain)
+    rest = domain[match.end():] if match else domain
+    host, sep, path = rest.partition('/')
+    key = host.lower() + sep + path
+    return key, f"{match.group(1).lower()}://{key}" if match else key
+
+# Function to normalize and deduplicate input entries, keeping input order
+def dedupe_domains(raw_domains, verbose=False):
+    """Return the targets to check, one per key; the first spelling of a duplicate wins,
+    including its scheme, and entries without a valid host are reported and skipped."""
+    normalized = {}
+    for key, target in (normalize_domain(domain) for domain in raw_domains if domain):
+        normalized.setdefault(key, target)
+    domains = []
+    for key, target in normalized.items():
+        if VALID_DOMAIN.fullmatch(key.partition('/')[0]):
+            domains.append(target)
+        elif key:
+            print(f"Skipping invalid domain: {target}")
+    duplicates = sum(1 for domain in raw_domains if domain) - len(normalized)
+    if verbose and duplicates:
+        print(f"Collapsed {duplicates} duplicate domains")
+    return domains
 
 # Main function to handle different input formats
-def process_domain(domain, proxy=None, verbose=False, output_file=None):
-    wayback_urls = check_wayback_urls(domain, verbose=verbose)
-    http_status = check_http_response(domain, proxy=proxy, verbose=verbose)
-    interesting_directories = find_interesting_urls(wayback_urls)
+def process_domain(domain, proxy=None, verbose=False, output_queue=None, print_queue=None):
+    # Run the HTTP check while this worker streams Wayback results. It goes to a
+    # separate pool so domain workers never wait on tasks queued behind themselves
+    status_future = get_executor(name='status').submit(check_http_response, domain, proxy, verbose)
+    wayback_count, interesting_directories = check_wayback_urls(normalize_domain(domain)[0], verbose=verbose)
+    http_status = status_future.result()
 
-    if output_file:
-        with open(output_file, 'a') as f:
-            f.write(f"{domain} | Wayback URLs: {len(wayback_urls)} | HTTP Status Code: {http_status}\n")
-            for key, value in interesting_directories.items():
-                if value > 0:
-                    f.write(f" - {key} URLs: [{value}]\n")
+    if output_queue is not None:
+        output_queue.put(format_plain_output(domain, wayback_count, http_status, interesting_directories))
+
+    if print_queue is not None:
+        print_queue.put(format_colored_output(domain, wayback_count, http_status, interesting_directories))
+    else:
+        print_colored_output(domain, wayback_count, http_status, interesting_directories)
 
-    print_colored_output(domain, len(wayback_urls), http_status, interesting_directories)
+def process_input(input_data, proxy=None, verbose=False, output_file=None, rate=DEFAULT_RATE, concurrency=DEFAULT_CONCURRENCY,
+                  use_cache=True, cache_ttl=DEFAULT_CACHE_TTL_HOURS):
+    from tqdm import tqdm
+
+    global WAYBACK_CACHE, PRINT_QUEUE
+    WAYBACK_LIMITER.rate = rate
+    # Give every worker its own pooled connection instead of discarding overflow ones
+    set_pool_maxsize(concurrency)
 
-def process_input(input_data, proxy=None, verbose=False, output_file=None):
     # Process domain names
     if ',' in input_data:
-        domains = [domain.strip() for domain in input_data.split(',')]
+        raw_domains = [domain.strip() for domain in input_data.split(',')]
     else:
         try:
-            with open(input_data, 'r') as file:
-                domains = [line.strip() for line in file if line.strip()]
+            raw_domains = read_domain_file(input_data)
         except FileNotFoundError:
-            domains = [input_data.strip()]
+            raw_domains = [input_data.strip()]
+
+    domains = dedupe_domains(raw_domains, verbose)
 
-    # Use ThreadPoolExecutor for parallel processing
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = {executor.submit(process_domain, domain, proxy, verbose, output_file): domain for domain in domains}
-        for future in tqdm(as_completed(futures), total=len(domains), desc="Processing domains"):
-            future.result()
+    # Start resolving every hostname in parallel, in input order; each HTTP check waits only
+    # for its own host. Results are per run: a library caller's next run sees fresh DNS
+    DNS_CACHE.clear()
+    if not proxy:
+        resolve_hosts(urlsplit(http_url(domain)).hostname for domain in domains)
+
+    # Open the output file here so a bad path fails the run before any work starts;
+    # a single writer thread then keeps it open for the whole run
+    output_queue = None
+    if output_file:
+        output_handle = open(output_file, 'a', buffering=1 << 16)
+        output_queue = queue.Queue()
+        writer_thread = threading.Thread(target=writer, args=(output_queue, output_handle), daemon=True)
+        writer_thread.start()
+
+    # Likewise a single printer thread owns stdout so workers never contend on it
+    print_queue = PRINT_QUEUE = queue.Queue()
+    printer_thread = threading.Thread(target=printer, args=(print_queue,), daemon=True)
+    printer_thread.start()
+
+    # Use the shared ThreadPoolExecutors for parallel processing
+    executor = get_executor(concurrency)
+    get_executor(concurrency, name='status')
+    try:
+        # The cache connection lives for this run only and is closed below
+        WAYBACK_CACHE = None
+        if use_cache:
+            try:
+                WAYBACK_CACHE = WaybackCache(ttl_hours=cache_ttl)
+            except (OSError, sqlite3.Error) as e:
+                log(f"Wayback cache unavailable, continuing without it: {e}")
+
+        futures = {executor.submit(process_domain, domain, proxy, verbose, output_queue, print_queue): domain for domain in domains}
+        # Coarse redraws keep the bar's lock and terminal writes off the hot path
+        with tqdm(total=len(domains), desc="Processing domains", file=sys.stderr,
+                  mininterval=0.5, miniters=max(1, len(domains) // 200)) as pbar:
+            for future in as_completed(futures):
+                future.result()
+                pbar.update(1)
+    finally:
+        if WAYBACK_CACHE is not None:
+            WAYBACK_CACHE.close()
+            WAYBACK_CACHE = None
+        # Anything logged after this point goes straight to stdout
+        PRINT_QUEUE = None
+        print_queue.put(None)
+        printer_thread.join()
+        if output_queue is not None:
+            output_queue.put(None)
+            writer_thread.join()
+            output_handle.close()
+
+# Argparse type for options that need a positive integer
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return number
 
 # Command-line argument parsing
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Recon Tool for checking Wayback URLs and HTTP status codes.")
-    parser.add_argument('input', help="Input: a file containing domains or a single domain or comma-separated domains")
+    parser.add_argument('input', nargs='?', help="Input: a file containing domains or a single domain or comma-separated domains")
     parser.add_argument('-o', '--output', help="Output file to save results", default=None)
-    parser.add_argument('--proxy', help="Specify proxy for curl requests", default=None)
+    parser.add_argument('--proxy', help="Specify proxy for HTTP status requests", default=None)
+    parser.add_argument('--rate', type=float, help="Max Wayback CDX requests per second (0 disables throttling)", default=DEFAULT_RATE)
+    parser.add_argument('--concurrency', type=positive_int, help="Number of domains processed concurrently", default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--no-cache', action='store_true', help="Always query the Wayback CDX API instead of the on-disk cache")
+    parser.add_argument('--cache-ttl', type=float, help="Hours before cached Wayback results expire", default=DEFAULT_CACHE_TTL_HOURS)
+    parser.add_argument('--check-deps', action='store_true', help="Re-check (and install) Python dependencies")
     parser.add_argument('-v', action='store_true', help="Verbose output")
     parser.add_argument('-vv', action='store_true', help="Extra verbose output")
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.input is None and not args.check_deps:
+        parser.error("the following arguments are required: input")
+    return args
 
 if __name__ == "__main__":
-    # Install required dependencies
-    install_missing_packages()
-    ensure_dependencies()
-
     # Parse command-line arguments
     args = parse_arguments()
 
+    # Install required dependencies (once per install unless --check-deps is given)
+    ensure_dependencies(force=args.check_deps)
+    if args.input is None:
+        sys.exit(0)
+
     # Process input
-    process_input(args.input, proxy=args.proxy, verbose=args.v or args.vv, output_file=args.output)
+    process_input(args.input, proxy=args.proxy, verbose=args.v or args.vv, output_file=args.output,
+                  rate=args.rate, concurrency=args.concurrency,
+                  use_cache=not args.no_cache, cache_ttl=args.cache_ttl)
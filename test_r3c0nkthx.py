@@ -0,0 +1,124 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from array import array
+from contextlib import redirect_stdout
+from email.utils import formatdate
+from unittest import mock
+
+import bench_r3c0nkthx
+import r3c0nkthx
+
+
+class PatternMatcherTest(unittest.TestCase):
+    def test_patterns_sharing_a_prefix_are_all_found(self):
+        match = r3c0nkthx.build_pattern_matcher(("/api", "/api/v1", "pi/", "/js/"))
+        counts = array("Q", bytes(8 * 4))
+        match(b"/api/v1/", counts)
+        self.assertEqual(list(counts), [1, 1, 1, 0])
+
+    def test_each_line_of_a_buffer_counts_once_per_pattern(self):
+        match = r3c0nkthx.build_pattern_matcher(("/js/", "token"))
+        counts = array("Q", bytes(8 * 2))
+        match(b"/js/a/js/b\n/css/\ntoken/js/token\n/js/", counts)
+        self.assertEqual(list(counts), [3, 1])
+
+    def test_counts_match_the_baseline_loop(self):
+        urls = bench_r3c0nkthx.synthetic_urls(5000)
+        reference = bench_r3c0nkthx.baseline_find_interesting_urls(urls)
+        self.assertEqual(r3c0nkthx.find_interesting_urls(urls), reference)
+        chunks = bench_r3c0nkthx.cdx_chunks(urls, size=4096)
+        self.assertEqual(bench_r3c0nkthx.scan_blocks(chunks), reference)
+
+    def test_overlapping_patterns_are_counted_once_per_url(self):
+        counts = r3c0nkthx.find_interesting_urls([
+            "http://example.com/api/js/app.js",
+            b"http://example.com/wp-admin/?password=1&password=2",
+            "http://example.com/",
+        ])
+        self.assertEqual(counts["/api/"], 1)
+        self.assertEqual(counts["/js/"], 1)
+        self.assertEqual(counts["/wp-admin/"], 1)
+        self.assertEqual(counts["password="], 1)
+        self.assertEqual(counts["/admin/"], 0)
+
+
+class DomainNormalizationTest(unittest.TestCase):
+    def test_scheme_and_host_case(self):
+        self.assertEqual(r3c0nkthx.normalize_domain("HTTPS://Example.COM/"), ("example.com", "https://example.com"))
+        self.assertEqual(r3c0nkthx.normalize_domain(" Example.com "), ("example.com", "example.com"))
+
+    def test_path_is_kept_with_its_case(self):
+        self.assertEqual(r3c0nkthx.normalize_domain("http://Example.com/Docs/"),
+                         ("example.com/Docs", "http://example.com/Docs"))
+
+    def test_host_with_port(self):
+        self.assertEqual(r3c0nkthx.normalize_domain("Example.com:8443"), ("example.com:8443", "example.com:8443"))
+        self.assertEqual(r3c0nkthx.dedupe_domains(["example.com:8443/admin"]), ["example.com:8443/admin"])
+
+    def test_first_spelling_of_a_duplicate_wins(self):
+        domains = r3c0nkthx.dedupe_domains(["https://Example.com", "example.com", "http://EXAMPLE.com/", "other.com"])
+        self.assertEqual(domains, ["https://example.com", "other.com"])
+
+    def test_invalid_entries_are_skipped(self):
+        with redirect_stdout(io.StringIO()) as out:
+            domains = r3c0nkthx.dedupe_domains(["bad domain!", "", "ok.com", "exa$mple.com", "host:port"])
+        self.assertEqual(domains, ["ok.com"])
+        self.assertIn("Skipping invalid domain: exa$mple.com", out.getvalue())
+
+
+class WaybackCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = r3c0nkthx.WaybackCache(path=os.path.join(directory.name, "cache.sqlite3"), ttl_hours=1)
+        self.addCleanup(self.cache.close)
+        self.counts = dict.fromkeys(r3c0nkthx.INTERESTING_PATTERNS, 2)
+        self.cache.set("example.com", 10, self.counts)
+
+    def test_fresh_entry_is_returned(self):
+        self.assertEqual(self.cache.get("example.com"), (10, self.counts))
+        self.assertIsNone(self.cache.get("other.com"))
+
+    def test_entry_expires_after_ttl(self):
+        with mock.patch.object(r3c0nkthx.time, "time", return_value=time.time() + 3601):
+            self.assertIsNone(self.cache.get("example.com"))
+
+    def test_changed_pattern_set_invalidates_entry(self):
+        with mock.patch.object(r3c0nkthx, "INTERESTING_PATTERNS", r3c0nkthx.INTERESTING_PATTERNS + ("/new/",)):
+            self.assertIsNone(self.cache.get("example.com"))
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_block_freezes_acquire(self):
+        limiter = r3c0nkthx.RateLimiter(rate=0)
+        limiter.block(0.2)
+        start = time.monotonic()
+        limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+    def test_block_drains_tokens(self):
+        limiter = r3c0nkthx.RateLimiter(rate=10)
+        limiter.block(0)
+        start = time.monotonic()
+        limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+
+class RetryAfterTest(unittest.TestCase):
+    def test_seconds(self):
+        self.assertEqual(r3c0nkthx.parse_retry_after("120"), 120)
+
+    def test_http_date(self):
+        self.assertAlmostEqual(r3c0nkthx.parse_retry_after(formatdate(time.time() + 60, usegmt=True)), 60, delta=2)
+        self.assertEqual(r3c0nkthx.parse_retry_after(formatdate(time.time() - 60, usegmt=True)), 0)
+
+    def test_missing_or_invalid(self):
+        self.assertEqual(r3c0nkthx.parse_retry_after(None), 0)
+        self.assertEqual(r3c0nkthx.parse_retry_after("soon"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()